@@ -25,6 +25,6 @@ def solve_from_rows(rows: Sequence[Sequence[int]]) -> Iterable[int]:
 if __name__ == "__main__":
     start = SlidePuzzleState.solved(3).shuffle(30)
     solution = solve_puzzle(start)
-    print("Start:", start.tiles)
+    print("Start:", list(start.tiles))
     print("Moves (tile numbers):", solution)
     print("Solution length:", len(solution))
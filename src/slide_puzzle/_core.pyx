@@ -0,0 +1,97 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""C versions of the linear-conflict heuristic helpers in ``puzzle.py``.
+
+They read ``SlidePuzzleState.packed`` directly (4 bits per square, so boards
+up to 4x4) and take the same ``target`` bytes as the Python helpers. Build in
+place with ``cythonize -i src/slide_puzzle/_core.pyx``; without the compiled
+module the pure-Python versions are used.
+"""
+
+ctypedef unsigned long long u64
+
+MAX_SIZE = 4
+
+
+cdef inline int _tile(u64 packed, int index) noexcept nogil:
+    return <int>((packed >> (4 * index)) & 0xF)
+
+
+cdef inline int _abs(int value) noexcept nogil:
+    return -value if value < 0 else value
+
+
+cdef int _line_conflicts(u64 packed, int size, const unsigned char* target, int line, bint vertical) noexcept nogil:
+    cdef int targets[4]
+    cdef int longest[4]
+    cdef int count = 0
+    cdef int best = 0
+    cdef int offset, idx, tile, tr, tc, i, j
+    for offset in range(size):
+        idx = offset * size + line if vertical else line * size + offset
+        tile = _tile(packed, idx)
+        if tile == 0:
+            continue
+        tr = target[tile] // size
+        tc = target[tile] % size
+        if vertical and tc == line:
+            targets[count] = tr
+            count += 1
+        elif not vertical and tr == line:
+            targets[count] = tc
+            count += 1
+    for i in range(count):
+        longest[i] = 1
+        for j in range(i):
+            if targets[j] < targets[i] and longest[j] >= longest[i]:
+                longest[i] = longest[j] + 1
+        if longest[i] > best:
+            best = longest[i]
+    return count - best
+
+
+cpdef int manhattan(u64 packed, int size, bytes target):
+    cdef const unsigned char* goal = target
+    cdef int total = 0
+    cdef int idx, tile
+    for idx in range(size * size):
+        tile = _tile(packed, idx)
+        if tile == 0:
+            continue
+        total += _abs(idx // size - goal[tile] // size) + _abs(idx % size - goal[tile] % size)
+    return total
+
+
+cpdef int linear_conflict(u64 packed, int size, bytes target):
+    cdef const unsigned char* goal = target
+    cdef int total = manhattan(packed, size, target)
+    cdef int line
+    for line in range(size):
+        total += 2 * (_line_conflicts(packed, size, goal, line, False) + _line_conflicts(packed, size, goal, line, True))
+    return total
+
+
+cpdef int heuristic_delta(object parent, object child, int tile, bytes target):
+    """Drop-in for ``puzzle._heuristic_delta`` on boards up to 4x4."""
+    cdef const unsigned char* goal = target
+    cdef int size = parent.size
+    cdef u64 before = parent.packed
+    cdef u64 after = child.packed
+    cdef int blank = parent.blank_index
+    cdef int moved_from = child.blank_index
+    cdef int tr = goal[tile] // size
+    cdef int tc = goal[tile] % size
+    cdef int br = blank // size
+    cdef int bc = blank % size
+    cdef int nr = moved_from // size
+    cdef int nc = moved_from % size
+    cdef int delta = _abs(br - tr) + _abs(bc - tc) - _abs(nr - tr) - _abs(nc - tc)
+    cdef bint vertical = bc != nc
+    cdef int first = bc if vertical else br
+    cdef int second = nc if vertical else nr
+    delta += 2 * (
+        _line_conflicts(after, size, goal, first, vertical)
+        + _line_conflicts(after, size, goal, second, vertical)
+        - _line_conflicts(before, size, goal, first, vertical)
+        - _line_conflicts(before, size, goal, second, vertical)
+    )
+    return delta
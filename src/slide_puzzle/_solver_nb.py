@@ -0,0 +1,257 @@
+"""Numba-compiled A* for boards up to 4x4.
+
+States use the same layout as ``SlidePuzzleState.packed``: 4 bits per board
+position, so a 4x4 board fits exactly in one ``uint64``. Importing this module
+raises ``ImportError`` when numba/numpy are unavailable.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numba import njit, types
+from numba.typed import Dict
+
+MAX_SIZE = 4
+
+_MASK = np.uint64(0xF)
+
+
+@njit(cache=True)
+def _tile_at(packed, index):
+    return np.int64((packed >> np.uint64(index * 4)) & _MASK)
+
+
+@njit(cache=True)
+def _swap(packed, idx_a, idx_b):
+    shift_a = np.uint64(idx_a * 4)
+    shift_b = np.uint64(idx_b * 4)
+    diff = ((packed >> shift_a) ^ (packed >> shift_b)) & _MASK
+    return packed ^ (diff << shift_a) ^ (diff << shift_b)
+
+
+@njit(cache=True)
+def _neighbors(size, blank, out):
+    """Write the board indices adjacent to ``blank`` into ``out``; return how many."""
+    row = blank // size
+    col = blank % size
+    count = 0
+    if row > 0:
+        out[count] = blank - size
+        count += 1
+    if row < size - 1:
+        out[count] = blank + size
+        count += 1
+    if col > 0:
+        out[count] = blank - 1
+        count += 1
+    if col < size - 1:
+        out[count] = blank + 1
+        count += 1
+    return count
+
+
+@njit(cache=True)
+def _manhattan(packed, size):
+    total = 0
+    for idx in range(size * size):
+        tile = _tile_at(packed, idx)
+        if tile == 0:
+            continue
+        goal = tile - 1
+        total += abs(idx // size - goal // size) + abs(idx % size - goal % size)
+    return total
+
+
+@njit(cache=True)
+def _line_conflicts(packed, size, line, vertical):
+    """Tiles that must step out of a row (or column) to unblock it: the line's
+    own tiles minus the longest run already in goal order."""
+    targets = np.empty(MAX_SIZE, dtype=np.int64)
+    longest = np.empty(MAX_SIZE, dtype=np.int64)
+    count = 0
+    for offset in range(size):
+        idx = offset * size + line if vertical else line * size + offset
+        tile = _tile_at(packed, idx)
+        if tile == 0:
+            continue
+        gr = (tile - 1) // size
+        gc = (tile - 1) % size
+        if vertical and gc == line:
+            targets[count] = gr
+            count += 1
+        elif not vertical and gr == line:
+            targets[count] = gc
+            count += 1
+    best = 0
+    for i in range(count):
+        longest[i] = 1
+        for j in range(i):
+            if targets[j] < targets[i] and longest[j] >= longest[i]:
+                longest[i] = longest[j] + 1
+        if longest[i] > best:
+            best = longest[i]
+    return count - best
+
+
+@njit(cache=True)
+def _linear_conflict(packed, size):
+    total = _manhattan(packed, size)
+    for line in range(size):
+        total += 2 * (_line_conflicts(packed, size, line, False) + _line_conflicts(packed, size, line, True))
+    return total
+
+
+@njit(cache=True)
+def _heap_push(keys, states, info, length, key, state, cost, h, blank, parent):
+    """Push onto a heap of ``length`` entries; ``info`` rows hold (g, h, blank, parent)."""
+    pos = length
+    while pos > 0:
+        up = (pos - 1) >> 1
+        if keys[up] <= key:
+            break
+        keys[pos] = keys[up]
+        states[pos] = states[up]
+        for col in range(4):
+            info[pos, col] = info[up, col]
+        pos = up
+    keys[pos] = key
+    states[pos] = state
+    info[pos, 0] = cost
+    info[pos, 1] = h
+    info[pos, 2] = blank
+    info[pos, 3] = parent
+
+
+@njit(cache=True)
+def _heap_pop_into(keys, states, info, length):
+    """Remove the root of a heap of ``length`` entries, restoring the invariant."""
+    last = length - 1
+    key = keys[last]
+    pos = 0
+    while True:
+        child = 2 * pos + 1
+        if child >= last:
+            break
+        if child + 1 < last and keys[child + 1] < keys[child]:
+            child += 1
+        if keys[child] >= key:
+            break
+        keys[pos] = keys[child]
+        states[pos] = states[child]
+        for col in range(4):
+            info[pos, col] = info[child, col]
+        pos = child
+    keys[pos] = key
+    states[pos] = states[last]
+    for col in range(4):
+        info[pos, col] = info[last, col]
+
+
+@njit(cache=True)
+def _priority_key(cost, h, weight, counter):
+    # f = g + w*h in 1/256ths, with ties broken on insertion order like
+    # (f, counter) tuples in heapq.
+    return (np.int64((cost + weight * h) * 256.0) << 32) | counter
+
+
+@njit(cache=True)
+def astar(start_packed, size, start_blank, weight):
+    """Return the tiles to move, in order, or an empty array if unsolvable.
+
+    Linear-conflict distance is consistent, so the first time a state is popped
+    its cost is optimal: it is closed there and later copies are skipped.
+    With ``weight > 1`` states are never reopened either, which keeps the
+    usual bound of ``weight`` times the optimal length.
+
+    ``came_from`` doubles as the closed set and stores only the parent's
+    blank index, since the parent is the child with that square swapped back
+    into the child's blank. Heap entries carry that parent until then.
+    """
+    goal = np.uint64(0)
+    for idx in range(size * size - 1):
+        goal |= np.uint64(idx + 1) << np.uint64(idx * 4)
+
+    came_from = Dict.empty(key_type=types.uint64, value_type=types.int64)
+
+    capacity = 1024
+    keys = np.empty(capacity, dtype=np.int64)
+    states = np.empty(capacity, dtype=np.uint64)
+    info = np.empty((capacity, 4), dtype=np.int64)
+    adjacent = np.empty(4, dtype=np.int64)
+
+    counter = 0
+    start_h = _linear_conflict(start_packed, size)
+    _heap_push(keys, states, info, 0, _priority_key(0, start_h, weight, 0), start_packed, 0, start_h, start_blank, -1)
+    length = 1
+
+    found = False
+    end = start_packed
+    end_blank = start_blank
+    end_cost = 0
+    while length > 0:
+        current = states[0]
+        cost = info[0, 0]
+        current_h = info[0, 1]
+        blank = info[0, 2]
+        parent = info[0, 3]
+        _heap_pop_into(keys, states, info, length)
+        length -= 1
+        if current in came_from:
+            continue
+        came_from[current] = parent
+        if current == goal:
+            found = True
+            end = current
+            end_blank = blank
+            end_cost = cost
+            break
+
+        tentative = cost + 1
+        br = blank // size
+        bc = blank % size
+        for i in range(_neighbors(size, blank, adjacent)):
+            idx = adjacent[i]
+            neighbor = _swap(current, blank, idx)
+            if neighbor in came_from:
+                continue
+            tile = _tile_at(current, idx)
+            gr = (tile - 1) // size
+            gc = (tile - 1) % size
+            h = current_h + abs(br - gr) + abs(bc - gc) - abs(idx // size - gr) - abs(idx % size - gc)
+            # Only the two lines the tile crossed can change their conflicts.
+            vertical = idx % size != bc
+            first = bc if vertical else br
+            second = idx % size if vertical else idx // size
+            h += 2 * (
+                _line_conflicts(neighbor, size, first, vertical)
+                + _line_conflicts(neighbor, size, second, vertical)
+                - _line_conflicts(current, size, first, vertical)
+                - _line_conflicts(current, size, second, vertical)
+            )
+            if length == capacity:
+                capacity *= 2
+                keys = np.concatenate((keys, np.empty(capacity - length, dtype=np.int64)))
+                states = np.concatenate((states, np.empty(capacity - length, dtype=np.uint64)))
+                info = np.concatenate((info, np.empty((capacity - length, 4), dtype=np.int64)))
+            counter += 1
+            key = _priority_key(tentative, h, weight, counter)
+            _heap_push(keys, states, info, length, key, neighbor, tentative, h, idx, blank)
+            length += 1
+
+    if not found:
+        return np.empty(0, dtype=np.int32)
+
+    moves = np.empty(end_cost, dtype=np.int32)
+    current = end
+    blank = end_blank
+    for step in range(end_cost - 1, -1, -1):
+        parent_blank = came_from[current]
+        moves[step] = _tile_at(current, parent_blank)
+        current = _swap(current, blank, parent_blank)
+        blank = parent_blank
+    return moves
+
+
+def warmup() -> None:
+    """Compile (or load from cache) the solver so the first real solve is fast."""
+    astar(np.uint64(0x087654321), 3, 8, 1.0)
@@ -8,26 +8,31 @@ from typing import Dict, List, Optional
 from PIL import ImageTk
 
 from .image_slicer import slice_image
-from .puzzle import SlidePuzzleState, solve_puzzle
+from .puzzle import SlidePuzzleState, solve_puzzle, warmup_solver
 
 
 class SlidePuzzleApp(tk.Tk):
-    def __init__(self, grid_size: int = 3, tile_pixels: int = 150) -> None:
+    def __init__(self, grid_size: int = 3, tile_pixels: int = 150, solver_weight: float = 1.2) -> None:
         super().__init__()
         self.title("Slide Puzzle")
         self.resizable(True, True)
 
         self.grid_size = grid_size
         self.tile_pixels = tile_pixels
+        self.solver_weight = solver_weight
 
         self.state: Optional[SlidePuzzleState] = None
         self.photo_cache: Dict[int, ImageTk.PhotoImage] = {}
         self.buttons: List[tk.Button] = []
+        # Tile each button currently shows; -1 forces the next render to redraw it.
+        self._current_tile_ids: List[int] = [-1] * (grid_size * grid_size)
         self._solving = False
 
         self.status_var = tk.StringVar(value="Upload an image!!")
 
         self._build_widgets()
+        # Pay the solver's one-off compile cost while the user picks an image.
+        threading.Thread(target=warmup_solver, daemon=True).start()
 
     def _build_widgets(self) -> None:
         controls = tk.Frame(self)
@@ -72,6 +77,7 @@ class SlidePuzzleApp(tk.Tk):
             return
 
         self.photo_cache = {tile: ImageTk.PhotoImage(image) for tile, image in pil_tiles.items()}
+        self._current_tile_ids = [-1] * len(self.buttons)
         self.state = SlidePuzzleState.solved(self.grid_size)
         self.state = self.state.shuffle(moves=80)
         self.status_var.set("Puzzle shuffled. Click tiles adjacent to the blank space.")
@@ -82,24 +88,32 @@ class SlidePuzzleApp(tk.Tk):
     def render_board(self) -> None:
         if self.state is None:
             return
-        for idx, tile in enumerate(self.state.tiles):
-            button = self.buttons[idx]
-            if tile == 0:
-                blank_image = self.photo_cache.get(0)
-                button.config(
-                    image=blank_image,
-                    text="" if blank_image else " ",
-                    state=tk.DISABLED,
-                    bg="#111",
-                )
-            else:
-                tile_image = self.photo_cache.get(tile)
-                button.config(
-                    image=tile_image,
-                    text="" if tile_image else str(tile),
-                    state=tk.NORMAL,
-                    bg="white",
-                )
+        for idx in range(len(self.buttons)):
+            self._render_tile(idx)
+
+    def _render_tile(self, idx: int) -> None:
+        assert self.state is not None
+        tile = self.state.tile_at(idx)
+        if self._current_tile_ids[idx] == tile:
+            return
+        self._current_tile_ids[idx] = tile
+        button = self.buttons[idx]
+        if tile == 0:
+            blank_image = self.photo_cache.get(0)
+            button.config(
+                image=blank_image,
+                text="" if blank_image else " ",
+                state=tk.DISABLED,
+                bg="#111",
+            )
+        else:
+            tile_image = self.photo_cache.get(tile)
+            button.config(
+                image=tile_image,
+                text="" if tile_image else str(tile),
+                state=tk.NORMAL,
+                bg="white",
+            )
 
     def on_tile_click(self, index: int) -> None:
         if self.state is None or self._solving:
@@ -139,14 +153,17 @@ class SlidePuzzleApp(tk.Tk):
     def _solve_thread(self) -> None:
         assert self.state is not None
         try:
-            moves = solve_puzzle(self.state)
+            moves = solve_puzzle(self.state, weight=self.solver_weight)
         except Exception as exc:  # noqa: BLE001
             self.after(0, lambda: self._on_solve_failed(exc))
             return
         self.after(0, lambda: self._animate_solution(moves))
 
     def _on_solve_failed(self, exc: Exception) -> None:
-        self.status_var.set(f"Sorry dude, solver failed: {exc}")
+        self._finish_solving(f"Sorry dude, solver failed: {exc}")
+
+    def _finish_solving(self, message: str) -> None:
+        self.status_var.set(message)
         self.shuffle_btn.config(state=tk.NORMAL)
         self.solve_btn.config(state=tk.NORMAL)
         self._solving = False
@@ -154,23 +171,30 @@ class SlidePuzzleApp(tk.Tk):
     def _animate_solution(self, moves: List[int], delay_ms: int = 200) -> None:
         if self.state is None:
             return
-        if not moves:
-            self.status_var.set("Solved!")
-            self.shuffle_btn.config(state=tk.NORMAL)
-            self.solve_btn.config(state=tk.NORMAL)
-            self._solving = False
-            return
-        tile = moves.pop(0)
-        next_state = self.state.move_tile(tile)
-        if next_state is None:
-            self.status_var.set("Solver encountered an invalid move.")
-            self.shuffle_btn.config(state=tk.NORMAL)
-            self.solve_btn.config(state=tk.NORMAL)
-            self._solving = False
-            return
-        self.state = next_state
-        self.render_board()
-        self.after(delay_ms, lambda: self._animate_solution(moves, delay_ms))
+        # Replay the whole solution first, then schedule every frame at once.
+        frames: List[SlidePuzzleState] = []
+        state = self.state
+        for tile in moves:
+            next_state = state.move_tile(tile)
+            if next_state is None:
+                self._finish_solving("Solver encountered an invalid move.")
+                return
+            frames.append(next_state)
+            state = next_state
+        for step, frame in enumerate(frames, start=1):
+            self.after(delay_ms * step, self._show_frame, frame, step == len(frames))
+        if not frames:
+            self._finish_solving("Solved!")
+
+    def _show_frame(self, frame: SlidePuzzleState, last: bool) -> None:
+        assert self.state is not None
+        # A single move only swaps the old and new blank squares.
+        previous_blank = self.state.blank_index
+        self.state = frame
+        self._render_tile(previous_blank)
+        self._render_tile(frame.blank_index)
+        if last:
+            self._finish_solving("Solved!")
 
 
 __all__ = ["SlidePuzzleApp"]
@@ -24,9 +24,10 @@ def prepare_image(path: str, grid_size: int, tile_pixels: int) -> Image.Image:
     square = min(width, height)
     left = (width - square) // 2
     top = (height - square) // 2
-    source = source.crop((left, top, left + square, top + square))
     target_pixels = grid_size * tile_pixels
-    return source.resize((target_pixels, target_pixels), _LANCZOS)
+    # Resizing straight from the centred box skips a full-size intermediate crop.
+    box = (left, top, left + square, top + square)
+    return source.resize((target_pixels, target_pixels), _LANCZOS, box=box)
 
 
 def slice_image(path: str, grid_size: int = 3, tile_pixels: int = 150) -> Dict[int, Image.Image]:
@@ -1,29 +1,132 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from heapq import heappop, heappush
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 import random
+import sys
 
+from .pattern_db import PatternDatabase, load_pattern_database
 
-@dataclass(frozen=True)
+try:
+    import numpy as np
+
+    from . import _solver_nb
+except ImportError:  # numba/numpy are optional; fall back to the pure-Python search
+    _solver_nb = None
+
+try:
+    from . import _core
+except ImportError:  # the Cython extension is optional; see _core.pyx to build it
+    _core = None
+
+
+def _tile_bits(size: int) -> int:
+    """Bits needed per tile; 4 for 3x3/4x4 so the board fits in 64 bits."""
+    return max(4, (size * size - 1).bit_length())
+
+
+def _pack(size: int, tiles: Sequence[int]) -> int:
+    bits = _tile_bits(size)
+    packed = 0
+    for idx, value in enumerate(tiles):
+        packed |= value << (idx * bits)
+    return packed
+
+
+def _unpack(size: int, packed: int) -> bytes:
+    bits = _tile_bits(size)
+    mask = (1 << bits) - 1
+    return bytes((packed >> (idx * bits)) & mask for idx in range(size * size))
+
+
+_GOAL_RC: Dict[int, Tuple[Tuple[int, int], ...]] = {}
+
+
+def _goal_coordinates(size: int) -> Tuple[Tuple[int, int], ...]:
+    """Return ``(row, col)`` of each tile's solved position, indexed by tile."""
+    table = _GOAL_RC.get(size)
+    if table is None:
+        count = size * size
+        # Tile t is solved at index t - 1; the blank wraps round to the last square.
+        table = tuple(divmod((tile - 1) % count, size) for tile in range(count))
+        _GOAL_RC[size] = table
+    return table
+
+
+_NEIGHBORS: Dict[int, Tuple[Tuple[int, ...], ...]] = {}
+
+
+def _neighbor_table(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """Return the board indices adjacent to each square, indexed by square."""
+    table = _NEIGHBORS.get(size)
+    if table is None:
+        rows = []
+        for idx in range(size * size):
+            row, col = divmod(idx, size)
+            adjacent = []
+            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                nr, nc = row + dx, col + dy
+                if 0 <= nr < size and 0 <= nc < size:
+                    adjacent.append(nr * size + nc)
+            rows.append(tuple(adjacent))
+        table = tuple(rows)
+        _NEIGHBORS[size] = table
+    return table
+
+
+@dataclass(frozen=True, slots=True)
 class SlidePuzzleState:
-    """An immutable representation of an n x n sliding puzzle state."""
+    """An immutable representation of an n x n sliding puzzle state.
+
+    Tiles are packed into a single integer, ``_tile_bits(size)`` bits per
+    board position, so hashing and equality are plain integer operations.
+    """
 
     size: int
-    tiles: Tuple[int, ...]
+    packed: int
+    blank_index: int = field(compare=False)
 
     def __post_init__(self) -> None:
-        if len(self.tiles) != self.size * self.size:
+        tiles = self.tiles
+        if self.packed >> (len(tiles) * _tile_bits(self.size)):
             raise ValueError("Tile collection length does not match puzzle dimensions")
         expected = set(range(self.size * self.size))
-        missing = expected.difference(self.tiles)
+        missing = expected.difference(tiles)
         if missing:
             raise ValueError(f"State missing tiles: {sorted(missing)}")
+        if tiles[self.blank_index] != 0:
+            raise ValueError("Blank index does not point at the blank tile")
+
+    # ``packed`` already identifies the board and changes by two XORs per
+    # move, so it serves as the incremental hash directly. Both methods are
+    # hand-written so hash and equality checks skip the (size, packed)
+    # tuple the dataclass versions build.
+    def __hash__(self) -> int:
+        return hash(self.packed)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SlidePuzzleState):
+            return NotImplemented
+        return self.packed == other.packed and self.size == other.size
+
+    @classmethod
+    def _unchecked(cls, size: int, packed: int, blank_index: int) -> "SlidePuzzleState":
+        """Build a state from trusted parts, skipping ``__post_init__`` validation."""
+        state = object.__new__(cls)
+        object.__setattr__(state, "size", size)
+        object.__setattr__(state, "packed", packed)
+        object.__setattr__(state, "blank_index", blank_index)
+        return state
 
     @property
-    def blank_index(self) -> int:
-        return self.tiles.index(0)
+    def tiles(self) -> bytes:
+        """Tiles in board order, one byte each (so boards up to 16x16)."""
+        return _unpack(self.size, self.packed)
+
+    def tile_at(self, index: int) -> int:
+        bits = _tile_bits(self.size)
+        return (self.packed >> (index * bits)) & ((1 << bits) - 1)
 
     def index_of(self, tile: int) -> int:
         return self.tiles.index(tile)
@@ -32,24 +135,52 @@ class SlidePuzzleState:
         return divmod(index, self.size)
 
     def manhattan_distance(self) -> int:
-        goal_positions = {value: idx for idx, value in enumerate(range(1, self.size * self.size))}
+        goal_rc = _goal_coordinates(self.size)
         total = 0
         for idx, value in enumerate(self.tiles):
             if value == 0:
                 continue
-            goal_idx = goal_positions[value]
-            gx, gy = divmod(goal_idx, self.size)
+            gx, gy = goal_rc[value]
             cx, cy = self.coordinates(idx)
             total += abs(gx - cx) + abs(gy - cy)
         return total
 
+    def linear_conflict(self) -> int:
+        """Manhattan distance plus 2 for every tile that must leave its row or
+        column to let another tile of that line pass. Still admissible."""
+        return _linear_conflict(self, _goal_indices(self.size))
+
     def is_solved(self) -> bool:
-        return self.tiles == tuple(range(1, self.size * self.size)) + (0,)
+        last = self.size * self.size - 1
+        return self.blank_index == last and self == SlidePuzzleState.solved(self.size)
+
+    def is_solvable(self) -> bool:
+        """Check the permutation parity invariant that every legal move preserves."""
+        values = [value for value in self.tiles if value != 0]
+        inversions = sum(
+            1 for i, value in enumerate(values) for other in values[i + 1 :] if value > other
+        )
+        if self.size % 2 == 1:
+            return inversions % 2 == 0
+        blank_row = self.blank_index // self.size
+        return (inversions + blank_row) % 2 == (self.size - 1) % 2
 
     def swap(self, idx_a: int, idx_b: int) -> "SlidePuzzleState":
-        tiles_list = list(self.tiles)
-        tiles_list[idx_a], tiles_list[idx_b] = tiles_list[idx_b], tiles_list[idx_a]
-        return SlidePuzzleState(self.size, tuple(tiles_list))
+        bits = _tile_bits(self.size)
+        mask = (1 << bits) - 1
+        shift_a = idx_a * bits
+        shift_b = idx_b * bits
+        value_a = (self.packed >> shift_a) & mask
+        value_b = (self.packed >> shift_b) & mask
+        diff = value_a ^ value_b
+        packed = self.packed ^ (diff << shift_a) ^ (diff << shift_b)
+        if self.blank_index == idx_a:
+            blank = idx_b
+        elif self.blank_index == idx_b:
+            blank = idx_a
+        else:
+            blank = self.blank_index
+        return SlidePuzzleState._unchecked(self.size, packed, blank)
 
     def move_blank(self, dx: int, dy: int) -> Optional["SlidePuzzleState"]:
         row, col = self.coordinates(self.blank_index)
@@ -61,20 +192,14 @@ class SlidePuzzleState:
 
     def move_tile(self, tile: int) -> Optional["SlidePuzzleState"]:
         tile_index = self.index_of(tile)
-        br, bc = self.coordinates(self.blank_index)
-        tr, tc = self.coordinates(tile_index)
-        if abs(br - tr) + abs(bc - tc) != 1:
+        if tile_index not in _neighbor_table(self.size)[self.blank_index]:
             return None
         return self.swap(self.blank_index, tile_index)
 
     def legal_moves(self) -> Iterable[Tuple[int, "SlidePuzzleState"]]:
-        row, col = self.coordinates(self.blank_index)
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nr, nc = row + dx, col + dy
-            if 0 <= nr < self.size and 0 <= nc < self.size:
-                idx = nr * self.size + nc
-                tile = self.tiles[idx]
-                yield tile, self.swap(self.blank_index, idx)
+        blank = self.blank_index
+        for idx in _neighbor_table(self.size)[blank]:
+            yield self.tile_at(idx), self.swap(blank, idx)
 
     def iter_tiles(self) -> Iterable[int]:
         return iter(self.tiles)
@@ -82,25 +207,121 @@ class SlidePuzzleState:
     @staticmethod
     def solved(size: int) -> "SlidePuzzleState":
         values = tuple(range(1, size * size)) + (0,)
-        return SlidePuzzleState(size, values)
+        return SlidePuzzleState.from_sequence(size, values)
 
     @staticmethod
     def from_sequence(size: int, sequence: Sequence[int]) -> "SlidePuzzleState":
-        return SlidePuzzleState(size, tuple(sequence))
+        values = bytes(sequence)
+        if len(values) != size * size:
+            raise ValueError("Tile collection length does not match puzzle dimensions")
+        missing = set(range(size * size)).difference(values)
+        if missing:
+            raise ValueError(f"State missing tiles: {sorted(missing)}")
+        return SlidePuzzleState._unchecked(size, _pack(size, values), values.index(0))
 
     def shuffle(self, moves: int = 100, rng: Optional[random.Random] = None) -> "SlidePuzzleState":
         rng = rng or random.Random()
-        state = self
-        last_tile = None
+        neighbors = _neighbor_table(self.size)
+        bits = _tile_bits(self.size)
+        mask = (1 << bits) - 1
+        packed = self.packed
+        blank = self.blank_index
+        last_blank = -1
         for _ in range(moves):
-            options = list(state.legal_moves())
-            if last_tile is not None:
-                options = [item for item in options if item[0] != last_tile]
-                if not options:
-                    options = list(state.legal_moves())
-            tile, state = rng.choice(options)
-            last_tile = tile
-        return state
+            candidates = neighbors[blank]
+            # Never step the blank straight back to where it just came from:
+            # draw from the other candidates by skipping over that slot.
+            if last_blank in candidates:
+                pick = rng.randrange(len(candidates) - 1)
+                if pick >= candidates.index(last_blank):
+                    pick += 1
+            else:
+                pick = rng.randrange(len(candidates))
+            target = candidates[pick]
+            # The blank's bits are zero, so moving a tile is one XOR of it at both squares.
+            tile = (packed >> (target * bits)) & mask
+            packed ^= (tile << (target * bits)) | (tile << (blank * bits))
+            last_blank, blank = blank, target
+        return SlidePuzzleState._unchecked(self.size, packed, blank)
+
+def _goal_indices(size: int) -> bytes:
+    """Solved board index of each tile, indexed by tile: the ``target`` layout
+    shared by the heuristic helpers below and the ``_core`` extension."""
+    count = size * size
+    return bytes((tile - 1) % count for tile in range(count))
+
+
+def _line_conflicts(state: SlidePuzzleState, target: bytes, line: int, vertical: bool) -> int:
+    """Count the tiles that must step out of one row (or column) to unblock it.
+
+    Only tiles whose target lies in this line take part. Those already in
+    target order can stay, so the count is the line's length minus the
+    longest increasing run of target positions.
+    """
+    size = state.size
+    targets: List[int] = []
+    for offset in range(size):
+        idx = offset * size + line if vertical else line * size + offset
+        tile = state.tile_at(idx)
+        if tile == 0:
+            continue
+        tr, tc = divmod(target[tile], size)
+        if vertical and tc == line:
+            targets.append(tr)
+        elif not vertical and tr == line:
+            targets.append(tc)
+    if len(targets) < 2:
+        return 0
+    longest = [1] * len(targets)
+    for i in range(1, len(targets)):
+        for j in range(i):
+            if targets[j] < targets[i] and longest[j] >= longest[i]:
+                longest[i] = longest[j] + 1
+    return len(targets) - max(longest)
+
+
+def _linear_conflict(state: SlidePuzzleState, target: bytes) -> int:
+    size = state.size
+    if _core is not None and size <= _core.MAX_SIZE:
+        return _core.linear_conflict(state.packed, size, target)
+    total = 0
+    for idx, value in enumerate(state.tiles):
+        if value == 0:
+            continue
+        tr, tc = divmod(target[value], size)
+        cr, cc = divmod(idx, size)
+        total += abs(tr - cr) + abs(tc - cc)
+    for line in range(size):
+        total += 2 * (_line_conflicts(state, target, line, False) + _line_conflicts(state, target, line, True))
+    return total
+
+
+def _heuristic_delta(
+    parent: SlidePuzzleState, child: SlidePuzzleState, tile: int, target: bytes
+) -> int:
+    """Change in linear-conflict distance when ``tile`` moves from ``child.blank_index``
+    into ``parent.blank_index``. Only the two lines the tile crosses can change."""
+    size = parent.size
+    br, bc = divmod(parent.blank_index, size)
+    nr, nc = divmod(child.blank_index, size)
+    tr, tc = divmod(target[tile], size)
+    delta = abs(br - tr) + abs(bc - tc) - abs(nr - tr) - abs(nc - tc)
+    if bc == nc:
+        lines, vertical = (br, nr), False
+    else:
+        lines, vertical = (bc, nc), True
+    for line in lines:
+        delta += 2 * (
+            _line_conflicts(child, target, line, vertical) - _line_conflicts(parent, target, line, vertical)
+        )
+    return delta
+
+
+def _heuristic_delta_for(size: int) -> Callable[[SlidePuzzleState, SlidePuzzleState, int, bytes], int]:
+    """Pick the compiled ``heuristic_delta`` when it is built and fits the board."""
+    if _core is not None and size <= _core.MAX_SIZE:
+        return _core.heuristic_delta
+    return _heuristic_delta
 
 
 def reconstruct_path(came_from: Dict[SlidePuzzleState, Tuple[SlidePuzzleState, int]], goal: SlidePuzzleState) -> List[int]:
@@ -114,32 +335,194 @@ def reconstruct_path(came_from: Dict[SlidePuzzleState, Tuple[SlidePuzzleState, i
     return moves
 
 
-def solve_puzzle(start: SlidePuzzleState) -> List[int]:
-    """Return a sequence of tile numbers that solve the puzzle via A* search."""
+def warmup_solver() -> None:
+    """Compile the numba solver ahead of time, if it is installed."""
+    if _solver_nb is not None:
+        _solver_nb.warmup()
+
+
+def solve_puzzle(start: SlidePuzzleState, weight: float = 1.0) -> List[int]:
+    """Return a sequence of tile numbers that solve the puzzle.
+
+    Every search ranks states by ``g + weight * h``. The default weight of 1
+    gives an optimal solution; larger weights explore far fewer states and
+    return a solution at most ``weight`` times longer than optimal.
+
+    4x4 boards use IDA* with the pattern databases once they have been built
+    (see ``pattern_db``). Otherwise the compiled A* solver is used when numba
+    is available, then bidirectional A* for boards up to 4x4, and IDA* for
+    larger ones, whose memory use does not grow with the states explored.
+    """
 
     if start.is_solved():
         return []
+    if not start.is_solvable():
+        raise ValueError("Puzzle is unsolvable from the provided state")
+
+    if start.size == 4:
+        database = load_pattern_database()
+        if database is not None:
+            return _solve_ida_star_pdb(start, database, weight)
+
+    if _solver_nb is not None and start.size <= _solver_nb.MAX_SIZE:
+        # The numba solver shares the 4-bit layout, so ``packed`` passes straight through.
+        moves = _solver_nb.astar(np.uint64(start.packed), start.size, start.blank_index, float(weight))
+        return [int(tile) for tile in moves]
+
+    if start.size <= 4:
+        return _solve_bidirectional(start, weight)
+    return _solve_ida_star(start, weight)
+
+
+def _solve_ida_star(start: SlidePuzzleState, weight: float = 1.0) -> List[int]:
+    """Iterative-deepening A*: depth-first passes bounded by ``g + weight * h``.
+
+    Memory stays proportional to the solution length, with no frontier or
+    visited-state tables. Never returns for an unsolvable start.
+    """
+    size = start.size
+    goal = _goal_indices(size)
+    heuristic_delta = _heuristic_delta_for(size)
+    path: List[int] = []
+
+    def search(state: SlidePuzzleState, g: int, h: int, threshold: float, last_tile: int) -> float:
+        """Return -1 once solved, else the smallest f-cost that exceeded ``threshold``."""
+        f = g + weight * h
+        if f > threshold:
+            return f
+        if h == 0:
+            return -1
+        next_threshold = float("inf")
+        for tile, child in state.legal_moves():
+            if tile == last_tile:
+                continue
+            child_h = h + heuristic_delta(state, child, tile, goal)
+            path.append(tile)
+            result = search(child, g + 1, child_h, threshold, tile)
+            if result == -1:
+                return -1
+            path.pop()
+            if result < next_threshold:
+                next_threshold = result
+        return next_threshold
+
+    start_h = start.linear_conflict()
+    threshold = weight * start_h
+    while True:
+        threshold = search(start, 0, start_h, threshold, 0)
+        if threshold == -1:
+            return path
+
+
+def _solve_ida_star_pdb(start: SlidePuzzleState, database: PatternDatabase, weight: float = 1.0) -> List[int]:
+    """IDA* for 4x4 boards guided by the additive pattern databases.
+
+    Each group's table index is carried down the search, and a move updates
+    only the index of the group owning the moved tile.
+    """
+    tables = database.tables
+    pattern_of = database.pattern_of
+    shift_of = database.shift_of
+    indices = database.indices(start.tiles)
+    path: List[int] = []
+
+    def search(state: SlidePuzzleState, g: int, h: int, threshold: float, last_tile: int) -> float:
+        """Return -1 once solved, else the smallest f-cost that exceeded ``threshold``."""
+        f = g + weight * h
+        if f > threshold:
+            return f
+        if h == 0:  # every group is home, so the blank is too
+            return -1
+        next_threshold = float("inf")
+        blank = state.blank_index
+        for tile, child in state.legal_moves():
+            if tile == last_tile:
+                continue
+            group = pattern_of[tile]
+            table = tables[group]
+            before = indices[group]
+            # The tile moves from the child's blank square into the parent's.
+            after = before ^ ((blank ^ child.blank_index) << shift_of[tile])
+            indices[group] = after
+            path.append(tile)
+            result = search(child, g + 1, h - table[before] + table[after], threshold, tile)
+            if result == -1:
+                return -1
+            path.pop()
+            indices[group] = before
+            if result < next_threshold:
+                next_threshold = result
+        return next_threshold
+
+    start_h = database.estimate(indices)
+    threshold = weight * start_h
+    while True:
+        threshold = search(start, 0, start_h, threshold, 0)
+        if threshold == -1:
+            return path
+
+
+def _solve_bidirectional(start: SlidePuzzleState, weight: float = 1.0) -> List[int]:
+    """Bidirectional A*: alternate expansions from the start and from the goal.
+
+    The backward search runs the same moves (they are their own inverses) with
+    linear-conflict distance to the start arrangement. Whenever a successor already
+    has a cost in the opposite search, the combined cost bounds the best
+    meeting point; the search stops once neither frontier can beat it.
+    """
+    size = start.size
+    goal = SlidePuzzleState.solved(size)
+    start_indices = bytearray(size * size)
+    for idx, tile in enumerate(start.tiles):
+        start_indices[tile] = idx
+    targets = (_goal_indices(size), bytes(start_indices))
+    heuristic_delta = _heuristic_delta_for(size)
+
+    start_h = start.linear_conflict()
+    goal_h = _linear_conflict(goal, targets[1])
+    frontiers: Tuple[List[Tuple[float, int, int, SlidePuzzleState]], ...] = (
+        [(weight * start_h, 0, start_h, start)],
+        [(weight * goal_h, 1, goal_h, goal)],
+    )
+    g_scores: Tuple[Dict[SlidePuzzleState, int], ...] = ({start: 0}, {goal: 0})
+    came_from: Tuple[Dict[SlidePuzzleState, Tuple[SlidePuzzleState, int]], ...] = ({}, {})
+    closed: Tuple[Set[SlidePuzzleState], ...] = (set(), set())
+    counter = 2
 
-    goal = SlidePuzzleState.solved(start.size)
-    frontier: List[Tuple[int, int, SlidePuzzleState]] = []
-    counter = 0
-    heappush(frontier, (start.manhattan_distance(), counter, start))
-    came_from: Dict[SlidePuzzleState, Tuple[SlidePuzzleState, int]] = {}
-    g_score: Dict[SlidePuzzleState, int] = {start: 0}
+    best = sys.maxsize
+    meeting: Optional[SlidePuzzleState] = None
+    direction = 0
+    while frontiers[0] and frontiers[1]:
+        if best <= max(frontiers[0][0][0], frontiers[1][0][0]):
+            break
+        frontier = frontiers[direction]
+        g_score = g_scores[direction]
+        parents = came_from[direction]
+        done = closed[direction]
+        target = targets[direction]
+        opposite = g_scores[1 - direction]
+        direction = 1 - direction
 
-    while frontier:
-        _, _, current = heappop(frontier)
-        if current == goal:
-            return reconstruct_path(came_from, current)
+        _, _, current_h, current = heappop(frontier)
+        if current in done:
+            continue
+        done.add(current)
 
         current_cost = g_score[current]
         for tile, neighbor in current.legal_moves():
             tentative = current_cost + 1
-            if tentative < g_score.get(neighbor, float("inf")):
-                came_from[neighbor] = (current, tile)
+            if tentative < g_score.get(neighbor, sys.maxsize):
+                parents[neighbor] = (current, tile)
                 g_score[neighbor] = tentative
                 counter += 1
-                priority = tentative + neighbor.manhattan_distance()
-                heappush(frontier, (priority, counter, neighbor))
+                h = current_h + heuristic_delta(current, neighbor, tile, target)
+                heappush(frontier, (tentative + weight * h, counter, h, neighbor))
+                other = opposite.get(neighbor)
+                if other is not None and tentative + other < best:
+                    best = tentative + other
+                    meeting = neighbor
 
-    raise ValueError("Puzzle is unsolvable from the provided state")
+    if meeting is None:
+        raise ValueError("Puzzle is unsolvable from the provided state")
+    # Backward parents point towards the goal; replaying them moves the same tiles.
+    return reconstruct_path(came_from[0], meeting) + reconstruct_path(came_from[1], meeting)[::-1]